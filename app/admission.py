@@ -0,0 +1,176 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+from app.config import config
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limits for API work sharing the event loop with listeners.
+
+    Requests beyond the global or per-route limit wait in a bounded FIFO
+    queue; each release hands the freed slot to the oldest waiter that fits.
+    When the queue is full the request is rejected immediately (429 when a
+    single route is saturated, 503 when the whole service is), and queued
+    requests that cannot get a slot within the timeout are rejected with 503.
+    While listener handlers are running, up to listener_reserve global slots
+    are held back from the API (one per running handler, never below one API
+    slot), so incoming messages compete with fewer API coroutines.
+    """
+
+    def __init__(
+        self,
+        global_limit: int,
+        route_limits: dict[str, int],
+        default_route_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+        listener_reserve: int = 0,
+    ):
+        self.global_limit = global_limit
+        self.route_limits = route_limits
+        self.default_route_limit = default_route_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.listener_reserve = listener_reserve
+
+        self._active = 0
+        self._route_active: dict[str, int] = {}
+        self._waiters: deque[tuple[str, asyncio.Future]] = deque()
+        self._listener_active = 0
+        self._rejected = {"429": 0, "503": 0}
+
+    def _route_limit(self, route: str) -> int:
+        return self.route_limits.get(route, self.default_route_limit)
+
+    def _api_limit(self) -> int:
+        """Global API limit after reserving capacity for running listeners"""
+        if not self.global_limit:
+            return 0
+        reserved = min(self._listener_active, self.listener_reserve)
+        return max(self.global_limit - reserved, 1)
+
+    def _has_slot(self, route: str) -> bool:
+        limit = self._api_limit()
+        if limit and self._active >= limit:
+            return False
+        limit = self._route_limit(route)
+        if limit and self._route_active.get(route, 0) >= limit:
+            return False
+        return True
+
+    def _reject(self, status_code: int, reason: str) -> AdmissionRejected:
+        self._rejected[str(status_code)] += 1
+        return AdmissionRejected(status_code, reason, self.retry_after)
+
+    def _take(self, route: str) -> None:
+        self._active += 1
+        self._route_active[route] = self._route_active.get(route, 0) + 1
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the oldest waiters that fit"""
+        for entry in list(self._waiters):
+            route, waiter = entry
+            if waiter.done():
+                self._waiters.remove(entry)
+            elif self._has_slot(route):
+                self._waiters.remove(entry)
+                self._take(route)
+                waiter.set_result(None)
+
+    async def acquire(self, route: str) -> None:
+        """Take a slot for route, waiting in the queue if necessary"""
+        # Waiters left in the queue don't fit the current capacity (every
+        # release dispatches first), so a newcomer that fits can't jump them
+        if self._has_slot(route):
+            self._take(route)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            route_limit = self._route_limit(route)
+            if route_limit and self._route_active.get(route, 0) >= route_limit:
+                raise self._reject(429, f"Too many concurrent requests for {route}")
+            raise self._reject(503, "Service overloaded")
+
+        entry = (route, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(entry[1], timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject(503, "Timed out waiting for capacity")
+        except BaseException:
+            # Cancelled after the slot was handed over: give it back
+            if entry[1].done() and not entry[1].cancelled():
+                self.release(route)
+            raise
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+
+    def release(self, route: str) -> None:
+        self._active -= 1
+        self._route_active[route] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, route: str):
+        """Hold an API slot for route for the duration of the block"""
+        await self.acquire(route)
+        try:
+            yield
+        finally:
+            self.release(route)
+
+    @asynccontextmanager
+    async def listener_priority(self):
+        """Reserve API capacity for a listener handler while it runs"""
+        self._listener_active += 1
+        try:
+            yield
+        finally:
+            self._listener_active -= 1
+            self._dispatch()
+
+    def stats(self) -> dict:
+        """Current admission counters"""
+        return {
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "listener_active": self._listener_active,
+            "global_limit": self.global_limit,
+            "api_limit": self._api_limit(),
+            "max_queue": self.max_queue,
+            "routes": {
+                route: {
+                    "active": active,
+                    "waiting": sum(1 for r, _ in self._waiters if r == route),
+                    "limit": self._route_limit(route),
+                }
+                for route, active in self._route_active.items()
+            },
+            "rejected": dict(self._rejected),
+        }
+
+
+# Global instance
+admission_controller = AdmissionController(
+    global_limit=config.ADMISSION_GLOBAL_LIMIT,
+    route_limits=config.ADMISSION_ROUTE_LIMITS,
+    default_route_limit=config.ADMISSION_DEFAULT_ROUTE_LIMIT,
+    max_queue=config.ADMISSION_MAX_QUEUE,
+    queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=config.ADMISSION_RETRY_AFTER,
+    listener_reserve=config.ADMISSION_LISTENER_RESERVE,
+)
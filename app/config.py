@@ -3,6 +3,15 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _positive(name: str, default: str, cast=float):
+    """Read a numeric env var that must be greater than zero"""
+    value = cast(os.getenv(name, default))
+    if value <= 0:
+        raise ValueError(f"{name} must be greater than 0, got {value}")
+    return value
+
+
 class Config:
     # Telegram API credentials
     API_ID = int(os.getenv("TELEGRAM_API_ID", "0"))
@@ -11,6 +20,8 @@ class Config:
     # Server config
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "8001"))
+    # Auto-reload for development; set RELOAD=false in production
+    RELOAD = os.getenv("RELOAD", "true").lower() in ("1", "true", "yes")
 
     # Laravel integration
     LARAVEL_API_URL = os.getenv("LARAVEL_API_URL", "http://localhost:8000")
@@ -18,5 +29,34 @@ class Config:
 
     # Session storage
     SESSION_PATH = os.getenv("SESSION_PATH", "./sessions")
+    # Comma separated session ids whose listeners start on boot; /health
+    # reports ready once they have been started
+    WARM_SESSIONS = [sid.strip() for sid in os.getenv("WARM_SESSIONS", "").split(",") if sid.strip()]
+    # Seconds to wait for each warm session before reporting it as failed
+    WARM_TIMEOUT = _positive("WARM_TIMEOUT", "30")
+
+    # Admission control (0 disables a limit)
+    ADMISSION_GLOBAL_LIMIT = int(os.getenv("ADMISSION_GLOBAL_LIMIT", "32"))
+    ADMISSION_DEFAULT_ROUTE_LIMIT = int(os.getenv("ADMISSION_DEFAULT_ROUTE_LIMIT", "0"))
+    # Comma separated "route=limit" pairs, e.g. "/create-bot=4,/send-code=8"
+    ADMISSION_ROUTE_LIMITS = {
+        route.strip(): int(limit)
+        for route, limit in (
+            item.split("=", 1)
+            for item in os.getenv("ADMISSION_ROUTE_LIMITS", "/create-bot=4,/send-code=8").split(",")
+            if "=" in item
+        )
+    }
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+    # Global slots held back from the API while listener handlers run
+    ADMISSION_LISTENER_RESERVE = int(os.getenv("ADMISSION_LISTENER_RESERVE", "8"))
+
+    # Event loop profiling (can also be toggled via /admin/profiling)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+    PROFILING_LAG_INTERVAL = _positive("PROFILING_LAG_INTERVAL", "0.5")
+    PROFILING_SLOW_THRESHOLD = _positive("PROFILING_SLOW_THRESHOLD", "0.1")
+    PROFILING_TOP_N = _positive("PROFILING_TOP_N", "10", int)
 
 config = Config()
@@ -1,13 +1,30 @@
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.routing import Match
 import asyncio
-from pydantic import BaseModel
+import importlib
+import logging
+import time
+from pydantic import BaseModel, Field
 from typing import Optional
 import hashlib
 import hmac
 
 from app.config import config
-from app.telegram_service import telegram_service
+from app.admission import admission_controller, AdmissionRejected
+from app.profiling import profiler
+
+# Configure logging here so it doesn't depend on when the listener is imported
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Telethon-backed modules are imported in a worker thread (see import_lazily),
+# during warm-up or on first use, so the API can bind and answer /health quickly.
+BOOT_STARTED = time.monotonic()
+boot_state = {"ready": False, "ready_after": None, "warm": [], "failed": [], "error": None}
+_lazy_modules = {}
 
 app = FastAPI(
     title="Telegram Bot Creator Service",
@@ -24,6 +41,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Routes that bypass admission control
+ADMISSION_EXEMPT_PATHS = {"/", "/health", "/admission/stats", "/admin/profiling"}
+
+
+def _admission_route(request: Request) -> Optional[str]:
+    """Path template of the API route matching request, if any"""
+    for route in app.router.routes:
+        if isinstance(route, APIRoute) and route.matches(request.scope)[0] == Match.FULL:
+            return route.path
+    return None
+
+
+@app.middleware("http")
+async def admission_middleware(request: Request, call_next):
+    """Limit concurrent API work and shed load when saturated"""
+    # Unknown paths and exempt routes pass through unmetered
+    route = _admission_route(request)
+    if route is None or route in ADMISSION_EXEMPT_PATHS:
+        return await call_next(request)
+
+    try:
+        async with admission_controller.admit(route):
+            return await call_next(request)
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"success": False, "error": "overloaded", "message": e.reason},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
 
 # Request models
 class SendCodeRequest(BaseModel):
@@ -54,6 +101,13 @@ class SessionRequest(BaseModel):
     session_id: str
 
 
+class ProfilingRequest(BaseModel):
+    enabled: bool
+    slow_threshold: Optional[float] = Field(None, gt=0)
+    lag_interval: Optional[float] = Field(None, gt=0)
+    reset: bool = False
+
+
 # Auth dependency
 async def verify_api_key(x_api_key: str = Header(None)):
     if not config.LARAVEL_SECRET_KEY:
@@ -64,6 +118,19 @@ async def verify_api_key(x_api_key: str = Header(None)):
     return True
 
 
+async def import_lazily(name: str):
+    """Import a heavy module in a worker thread so the event loop keeps running"""
+    module = _lazy_modules.get(name)
+    if module is None:
+        module = _lazy_modules[name] = await asyncio.to_thread(importlib.import_module, name)
+    return module
+
+
+async def get_telegram_service():
+    """Get the TelegramService instance, importing Telethon on first use"""
+    return (await import_lazily("app.telegram_service")).telegram_service
+
+
 # Routes
 @app.get("/")
 async def root():
@@ -76,12 +143,30 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    if not boot_state["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "uptime": round(time.monotonic() - BOOT_STARTED, 3)},
+        )
+    return {
+        "status": "degraded" if boot_state["failed"] or boot_state["error"] else "healthy",
+        "ready_after": boot_state["ready_after"],
+        "warm_sessions": boot_state["warm"],
+        "failed_sessions": boot_state["failed"],
+        "error": boot_state["error"],
+    }
+
+
+@app.get("/admission/stats")
+async def admission_stats(_: bool = Depends(verify_api_key)):
+    """Current concurrency and load shedding counters"""
+    return admission_controller.stats()
 
 
 @app.post("/send-code")
 async def send_code(request: SendCodeRequest, _: bool = Depends(verify_api_key)):
     """Send OTP code to phone number"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.send_code(
         session_id=request.session_id,
         phone=request.phone
@@ -92,6 +177,7 @@ async def send_code(request: SendCodeRequest, _: bool = Depends(verify_api_key))
 @app.post("/verify-code")
 async def verify_code(request: VerifyCodeRequest, _: bool = Depends(verify_api_key)):
     """Verify OTP code and login"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.verify_code(
         session_id=request.session_id,
         phone=request.phone,
@@ -105,6 +191,7 @@ async def verify_code(request: VerifyCodeRequest, _: bool = Depends(verify_api_k
 @app.post("/check-session")
 async def check_session(request: SessionRequest, _: bool = Depends(verify_api_key)):
     """Check if session is still authorized"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.check_session(request.session_id)
     return result
 
@@ -112,6 +199,7 @@ async def check_session(request: SessionRequest, _: bool = Depends(verify_api_ke
 @app.post("/create-bot")
 async def create_bot(request: CreateBotRequest, _: bool = Depends(verify_api_key)):
     """Create a new bot via BotFather"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.create_bot(
         session_id=request.session_id,
         bot_name=request.bot_name,
@@ -123,6 +211,7 @@ async def create_bot(request: CreateBotRequest, _: bool = Depends(verify_api_key
 @app.post("/get-my-bots")
 async def get_my_bots(request: SessionRequest, _: bool = Depends(verify_api_key)):
     """Get list of user's bots"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.get_my_bots(request.session_id)
     return result
 
@@ -130,6 +219,7 @@ async def get_my_bots(request: SessionRequest, _: bool = Depends(verify_api_key)
 @app.post("/get-bot-token")
 async def get_bot_token(request: GetTokenRequest, _: bool = Depends(verify_api_key)):
     """Get token for existing bot"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.get_bot_token(
         session_id=request.session_id,
         bot_username=request.bot_username
@@ -140,6 +230,7 @@ async def get_bot_token(request: GetTokenRequest, _: bool = Depends(verify_api_k
 @app.post("/logout")
 async def logout(request: SessionRequest, _: bool = Depends(verify_api_key)):
     """Logout and remove session"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.logout(request.session_id)
     return result
 
@@ -147,39 +238,106 @@ async def logout(request: SessionRequest, _: bool = Depends(verify_api_key)):
 @app.post("/delete-session")
 async def delete_session(request: SessionRequest, _: bool = Depends(verify_api_key)):
     """Force delete session files (cleanup)"""
+    telegram_service = await get_telegram_service()
     result = await telegram_service.delete_session(request.session_id)
     return result
 
 
-from app.telegram_listener import TelegramUserbotListener
-
-# Initialize Listener Manager
-listener_manager = TelegramUserbotListener()
+# Listener Manager, created on first use
+_listener_manager = None
+_warm_task = None
+
+async def get_listener_manager():
+    """Get the listener manager, creating it on first use"""
+    global _listener_manager
+    if _listener_manager is None:
+        module = await import_lazily("app.telegram_listener")
+        # Another caller may have created it while the import was running
+        if _listener_manager is None:
+            _listener_manager = module.TelegramUserbotListener()
+    return _listener_manager
+
+async def _warm_session(manager, session_id: str):
+    """Start one listener session, giving up after WARM_TIMEOUT seconds"""
+    try:
+        await asyncio.wait_for(manager.start_session(session_id), timeout=config.WARM_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Warm-up of session {session_id} timed out after {config.WARM_TIMEOUT}s")
+
+async def warm_sessions():
+    """Preload Telethon, start the configured listener sessions, then mark the service ready"""
+    try:
+        await import_lazily("app.telegram_service")
+        manager = await get_listener_manager()
+        await asyncio.gather(*(_warm_session(manager, session_id) for session_id in config.WARM_SESSIONS))
+        for session_id in config.WARM_SESSIONS:
+            if session_id in manager.clients:
+                boot_state["warm"].append(session_id)
+            else:
+                boot_state["failed"].append(session_id)
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        boot_state["error"] = str(e)
+        boot_state["failed"] = [s for s in config.WARM_SESSIONS if s not in boot_state["warm"]]
+    finally:
+        boot_state["ready_after"] = round(time.monotonic() - BOOT_STARTED, 3)
+        boot_state["ready"] = True
 
 @app.on_event("startup")
 async def startup_event():
+    global _warm_task
     # In a real scenario, you might want to load active listeners from DB
-    pass
+    if config.PROFILING_ENABLED:
+        profiler.start()
+    _warm_task = asyncio.create_task(warm_sessions())
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    profiler.stop()
+    if _warm_task is not None and not _warm_task.done():
+        _warm_task.cancel()
+
     # Close all listener sessions
-    for session_id in list(listener_manager.clients.keys()):
-        await listener_manager.stop_session(session_id)
+    if _listener_manager is not None:
+        for session_id in list(_listener_manager.clients.keys()):
+            await _listener_manager.stop_session(session_id)
 
 @app.post("/listener/start")
 async def start_listener(request: SessionRequest, _: bool = Depends(verify_api_key)):
     """Start auto-reply listener for a session"""
     # Run in background to avoid blocking
-    asyncio.create_task(listener_manager.start_session(request.session_id))
+    manager = await get_listener_manager()
+    asyncio.create_task(manager.start_session(request.session_id))
     return {"success": True, "message": "Listener starting in background"}
 
 @app.post("/listener/stop")
 async def stop_listener(request: SessionRequest, _: bool = Depends(verify_api_key)):
     """Stop auto-reply listener for a session"""
-    await listener_manager.stop_session(request.session_id)
+    manager = await get_listener_manager()
+    await manager.stop_session(request.session_id)
     return {"success": True, "message": "Listener stopped"}
 
+@app.get("/admin/profiling")
+async def get_profiling(_: bool = Depends(verify_api_key)):
+    """Event loop lag, slowest handlers and blocking stack traces"""
+    return profiler.report()
+
+@app.post("/admin/profiling")
+async def set_profiling(request: ProfilingRequest, _: bool = Depends(verify_api_key)):
+    """Enable or disable event loop profiling at runtime"""
+    if request.slow_threshold is not None:
+        profiler.slow_threshold = request.slow_threshold
+    if request.lag_interval is not None:
+        profiler.lag_interval = request.lag_interval
+    if request.reset:
+        profiler.reset()
+
+    if request.enabled:
+        profiler.start()
+    else:
+        profiler.stop()
+    return {"success": True, "enabled": profiler.enabled}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=config.HOST, port=config.PORT)
@@ -0,0 +1,220 @@
+import sys
+import time
+import asyncio
+import logging
+import functools
+import threading
+import traceback
+from collections import deque
+from typing import Optional
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class _StepTimer:
+    """Await a coroutine while timing each step it runs on the event loop"""
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.busy = 0.0
+
+    def __await__(self):
+        it = self.coro.__await__()
+        send, arg = it.send, None
+        while True:
+            start = time.perf_counter()
+            try:
+                future = send(arg)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.busy += time.perf_counter() - start
+
+            try:
+                arg = yield future
+                send = it.send
+            except GeneratorExit:
+                it.close()
+                raise
+            except BaseException as e:
+                send, arg = it.throw, e
+
+
+class LoopProfiler:
+    """Opt-in event loop instrumentation.
+
+    Samples event loop lag, times profiled coroutines per session (wall time
+    and time spent holding the loop) and, from a watchdog thread that pings
+    the loop, records the loop thread's stack whenever a callback blocks
+    longer than the threshold. Timings are kept for at most max_timings
+    (name, session) pairs; beyond that the lowest ranked half is dropped.
+    """
+
+    def __init__(
+        self,
+        lag_interval: float,
+        slow_threshold: float,
+        top_n: int,
+        history: int = 50,
+        max_timings: int = 1000,
+    ):
+        self.enabled = False
+        self.lag_interval = lag_interval
+        self.slow_threshold = slow_threshold
+        self.top_n = top_n
+        self.max_timings = max(max_timings, top_n * 2)
+
+        self.lag_samples: deque = deque(maxlen=600)
+        self.slow_callbacks: deque = deque(maxlen=history)
+        self.timings: dict[tuple[str, Optional[str]], dict] = {}
+
+        self._sampler: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._watchdog_stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self) -> None:
+        """Enable profiling, must be called from the event loop thread"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._loop_thread_id = threading.get_ident()
+        loop = asyncio.get_running_loop()
+        self._sampler = loop.create_task(self._sample_lag())
+        self._watchdog_stop = threading.Event()
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(loop, self._watchdog_stop), name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info("Loop profiling enabled")
+
+    def stop(self) -> None:
+        """Disable profiling, collected data is kept until reset()"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self._sampler:
+            self._sampler.cancel()
+            self._sampler = None
+        self._watchdog_stop.set()
+        self._watchdog = None
+        logger.info("Loop profiling disabled")
+
+    def reset(self) -> None:
+        self.lag_samples.clear()
+        self.slow_callbacks.clear()
+        self.timings.clear()
+
+    async def _sample_lag(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.lag_interval)
+            lag = time.monotonic() - start - self.lag_interval
+            self.lag_samples.append(max(lag, 0.0))
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, stop: threading.Event) -> None:
+        while not stop.wait(self.slow_threshold):
+            # Ping the loop; if the ping isn't served in time the loop is blocked
+            pong = threading.Event()
+            sent = time.monotonic()
+            loop.call_soon_threadsafe(pong.set)
+            if pong.wait(self.slow_threshold) or stop.is_set():
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            while not pong.wait(self.slow_threshold):
+                if stop.is_set():
+                    return
+
+            blocked = time.monotonic() - sent
+            self.slow_callbacks.append({
+                "blocked_for": round(blocked, 4),
+                "at": time.time(),
+                "stack": stack,
+            })
+            logger.warning(f"Event loop blocked for {blocked:.3f}s:\n{stack}")
+
+    def record(self, name: str, session_id: Optional[str], elapsed: float, busy: float) -> None:
+        """Record one profiled call"""
+        stats = self.timings.get((name, session_id))
+        if stats is None:
+            stats = self.timings[(name, session_id)] = {
+                "calls": 0, "total": 0.0, "max": 0.0, "busy_total": 0.0, "busy_max": 0.0,
+            }
+        stats["calls"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        stats["busy_total"] += busy
+        stats["busy_max"] = max(stats["busy_max"], busy)
+        if len(self.timings) > self.max_timings:
+            self._evict_timings()
+
+        if busy >= self.slow_threshold:
+            logger.warning(f"[{session_id}] {name} held the event loop for {busy:.3f}s")
+
+    def _evict_timings(self) -> None:
+        """Keep the worst offenders, by blocking time then wall time"""
+        ranked = sorted(
+            self.timings.items(), key=lambda item: (item[1]["busy_max"], item[1]["max"]), reverse=True
+        )
+        self.timings = dict(ranked[:self.max_timings // 2])
+
+    def report(self) -> dict:
+        """Lag summary, slowest offenders and recent blocking stacks"""
+        lags = list(self.lag_samples)
+        rows = [
+            {
+                "name": name,
+                "session_id": session_id,
+                "calls": stats["calls"],
+                "avg": round(stats["total"] / stats["calls"], 4),
+                "max": round(stats["max"], 4),
+                "busy_total": round(stats["busy_total"], 4),
+                "busy_max": round(stats["busy_max"], 4),
+            }
+            for (name, session_id), stats in self.timings.items()
+        ]
+        return {
+            "enabled": self.enabled,
+            "lag_interval": self.lag_interval,
+            "slow_threshold": self.slow_threshold,
+            "loop_lag": {
+                "samples": len(lags),
+                "last": round(lags[-1], 4) if lags else None,
+                "avg": round(sum(lags) / len(lags), 4) if lags else None,
+                "max": round(max(lags), 4) if lags else None,
+            },
+            "slowest_blocking": sorted(rows, key=lambda r: r["busy_max"], reverse=True)[:self.top_n],
+            "slowest_wall": sorted(rows, key=lambda r: r["max"], reverse=True)[:self.top_n],
+            "slow_callbacks": list(self.slow_callbacks),
+        }
+
+
+# Global instance
+profiler = LoopProfiler(
+    lag_interval=config.PROFILING_LAG_INTERVAL,
+    slow_threshold=config.PROFILING_SLOW_THRESHOLD,
+    top_n=config.PROFILING_TOP_N,
+)
+
+
+def profiled(name: str):
+    """Time a coroutine method per session_id while profiling is enabled"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return await func(*args, **kwargs)
+
+            session_id = kwargs.get("session_id", args[1] if len(args) > 1 else None)
+            timer = _StepTimer(func(*args, **kwargs))
+            start = time.perf_counter()
+            try:
+                return await timer
+            finally:
+                profiler.record(name, session_id, time.perf_counter() - start, timer.busy)
+        return wrapper
+    return decorator
@@ -3,6 +3,8 @@ import asyncio
 import logging
 from telethon import TelegramClient, events
 from app.config import config
+from app.admission import admission_controller
+from app.profiling import profiled
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -37,7 +39,8 @@ class TelegramUserbotListener:
             # Register event handler
             @client.on(events.NewMessage(incoming=True))
             async def handler(event):
-                await self.handle_message(session_id, event, client)
+                async with admission_controller.listener_priority():
+                    await self.handle_message(session_id, event, client)
 
             self.clients[session_id] = client
             self.active_sessions.append(session_id)
@@ -51,6 +54,7 @@ class TelegramUserbotListener:
         except Exception as e:
             logger.error(f"Failed to start session {session_id}: {e}")
 
+    @profiled("TelegramUserbotListener.handle_message")
     async def handle_message(self, session_id, event, client):
         """Handle incoming message"""
         try:
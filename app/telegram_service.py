@@ -6,6 +6,7 @@ from telethon import TelegramClient
 from telethon.errors import SessionPasswordNeededError, PhoneCodeInvalidError, PhoneCodeExpiredError
 from telethon.tl.types import User
 from app.config import config
+from app.profiling import profiled
 
 
 class TelegramService:
@@ -36,6 +37,7 @@ class TelegramService:
 
         return client
 
+    @profiled("TelegramService.send_code")
     async def send_code(self, session_id: str, phone: str) -> dict:
         """Send verification code to phone number"""
         try:
@@ -56,6 +58,7 @@ class TelegramService:
                 "message": f"Gagal mengirim kode: {str(e)}"
             }
 
+    @profiled("TelegramService.verify_code")
     async def verify_code(self, session_id: str, phone: str, code: str, phone_code_hash: str, password: Optional[str] = None) -> dict:
         """Verify the code and login"""
         try:
@@ -111,6 +114,7 @@ class TelegramService:
                 "message": f"Gagal verifikasi: {str(e)}"
             }
 
+    @profiled("TelegramService.check_session")
     async def check_session(self, session_id: str) -> dict:
         """Check if session is still valid"""
         try:
@@ -140,6 +144,7 @@ class TelegramService:
                 "error": str(e)
             }
 
+    @profiled("TelegramService.create_bot")
     async def create_bot(self, session_id: str, bot_name: str, bot_username: str) -> dict:
         """Create a new bot via BotFather"""
         try:
@@ -222,6 +227,7 @@ class TelegramService:
                 "message": f"Gagal membuat bot: {str(e)}"
             }
 
+    @profiled("TelegramService.get_my_bots")
     async def get_my_bots(self, session_id: str) -> dict:
         """Get list of user's bots from BotFather"""
         try:
@@ -260,6 +266,7 @@ class TelegramService:
                 "error": str(e)
             }
 
+    @profiled("TelegramService.get_bot_token")
     async def get_bot_token(self, session_id: str, bot_username: str) -> dict:
         """Get token for an existing bot"""
         try:
@@ -304,6 +311,7 @@ class TelegramService:
                 "error": str(e)
             }
 
+    @profiled("TelegramService.logout")
     async def logout(self, session_id: str) -> dict:
         """Logout and remove session"""
         try:
@@ -354,6 +362,7 @@ class TelegramService:
             except:
                 pass
 
+    @profiled("TelegramService.delete_session")
     async def delete_session(self, session_id: str) -> dict:
         """Force delete session without logout (for cleanup)"""
         try:
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Startup time benchmark
+
+Measures how long `import app.main` takes and how long `run.py` needs until
+/health reports ready, for both the production (--prod) and reload boot paths.
+
+Usage: python benchmarks/startup.py [--runs 5] [--port 8099]
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+import subprocess
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bench_import(runs: int) -> list[float]:
+    """Time `import app.main` in a fresh interpreter"""
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        results.append(float(out.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def bench_ready(runs: int, port: int, prod: bool, timeout: float = 60.0) -> list[float]:
+    """Time from process spawn until /health returns 200"""
+    env = dict(os.environ, PORT=str(port), HOST="127.0.0.1")
+    args = [sys.executable, "run.py"] + (["--prod"] if prod else [])
+    url = f"http://127.0.0.1:{port}/health"
+    results = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen(args, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError(f"/health not ready after {timeout}s")
+                try:
+                    with urllib.request.urlopen(url, timeout=1) as response:
+                        if response.status == 200:
+                            break
+                except (urllib.error.URLError, ConnectionError):
+                    pass
+                time.sleep(0.02)
+            results.append(time.perf_counter() - start)
+        finally:
+            proc.terminate()
+            proc.wait()
+    return results
+
+
+def summary(samples: list[float]) -> dict:
+    return {
+        "runs": len(samples),
+        "min": round(min(samples), 3),
+        "median": round(statistics.median(samples), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8099)
+    opts = parser.parse_args()
+
+    print(json.dumps({
+        "import_app_main": summary(bench_import(opts.runs)),
+        "ready_prod": summary(bench_ready(opts.runs, opts.port, prod=True)),
+        "ready_reload": summary(bench_ready(opts.runs, opts.port, prod=False)),
+    }, indent=2))
@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 """
 Run the Telegram Bot Creator Service
+
+Set RELOAD=false (or pass --prod) in production to skip the file watcher
+and reloader process.
 """
+import sys
 import uvicorn
 from app.config import config
 
 if __name__ == "__main__":
+    reload = config.RELOAD and "--prod" not in sys.argv
     print(f"Starting Telegram Bot Creator Service on {config.HOST}:{config.PORT}")
     uvicorn.run(
         "app.main:app",
         host=config.HOST,
         port=config.PORT,
-        reload=True
+        reload=reload
     )